@@ -4,18 +4,29 @@ Music Video + Metadata Generator
 Genera un video desde 2 fotos + 1 audio WAV, hace OCR del texto en las fotos,
 genera título/descripción/hashtags para subir manualmente a YouTube.
 """
+from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import gc
+import hashlib
+import itertools
 import os
+import queue
 import sys
 import subprocess
+import tempfile
 import time
 import shutil
 import json
-import urllib.request
-import urllib.error
+import re
+import gzip
+import http.client
+import urllib.parse
+import wave
 
 # ──────────────────────────────────────────────
 # Instalación automática de dependencias
@@ -31,14 +42,17 @@ REQUIRED_PACKAGES = [
 def install_if_missing():
     if getattr(sys, "frozen", False):
         return
+    if not os.environ.get("AUTO_INSTALL_DEPS"):
+        # Sin la variable el arranque no paga el costo de chequear/pipear: las
+        # dependencias se importan recién al procesar y, si falta alguna, la UI
+        # muestra un diálogo con instrucciones (ver dependencies_help_message).
+        return
 
-    import importlib
-    missing = []
-    for pkg_name, import_name in REQUIRED_PACKAGES:
-        try:
-            importlib.import_module(import_name)
-        except ImportError:
-            missing.append(pkg_name)
+    import importlib.util
+    missing = [
+        pkg_name for pkg_name, import_name in REQUIRED_PACKAGES
+        if importlib.util.find_spec(import_name) is None
+    ]
     if missing:
         print(f"Instalando paquetes faltantes: {missing}")
         try:
@@ -55,28 +69,107 @@ def install_if_missing():
 install_if_missing()
 
 # ──────────────────────────────────────────────
-# Imports post-instalación
+# Imports diferidos
 # ──────────────────────────────────────────────
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import pytesseract
-import numpy as np
-
-# moviepy
-import importlib
-moviepy_module = importlib.import_module("moviepy")
-if hasattr(moviepy_module, "ImageClip") and hasattr(moviepy_module, "AudioFileClip"):
-    ImageClip = moviepy_module.ImageClip
-    AudioFileClip = moviepy_module.AudioFileClip
-else:
-    editor_module = importlib.import_module("moviepy.editor")
-    ImageClip = editor_module.ImageClip
-    AudioFileClip = editor_module.AudioFileClip
-
-import cv2
+# cv2 (~200ms), moviepy (~300ms con su detección de ffmpeg), numpy y
+# pytesseract no hacen falta para abrir la UI: se cargan recién cuando
+# arranca el procesamiento.
+Image = None
+pytesseract = None
+np = None
+cv2 = None
+moviepy_module = None
+ImageClip = None
+AudioFileClip = None
+_clip_fps_setter = None
+_clip_audio_setter = None
+
+_heavy_imports_lock = threading.Lock()
+
+# Permite que libtesseract use OpenMP internamente (sin pisar config del usuario)
+os.environ.setdefault("OMP_THREAD_LIMIT", "4")
+
+
+def load_heavy_modules():
+    """Importa PIL/pytesseract/numpy/cv2 la primera vez que se necesitan."""
+    global Image, pytesseract, np, cv2
+    if cv2 is not None:
+        return
+    with _heavy_imports_lock:
+        if cv2 is not None:
+            return
+        from PIL import Image as pil_image
+        import pytesseract as pytesseract_module
+        import numpy as numpy_module
+        import cv2 as cv2_module
+
+        # OpenCV puede paralelizar resize/cvtColor internamente
+        cv2_module.setNumThreads(os.cpu_count() or 1)
+
+        Image = pil_image
+        pytesseract = pytesseract_module
+        np = numpy_module
+        cv2 = cv2_module  # último: es el flag de "ya cargado"
+
+
+# tesserocr es opcional: enlaza libtesseract en el proceso y evita pagar un
+# subproceso + recarga de modelos (~50 MB) por cada imagen. Las instancias de
+# PyTessBaseAPI no son thread-safe, así que se guarda una por hilo.
+_tesserocr_local = threading.local()
+
+
+def get_tesserocr_api():
+    """Devuelve una PyTessBaseAPI del hilo actual, o None si tesserocr no está."""
+    if getattr(_tesserocr_local, "checked", False):
+        return getattr(_tesserocr_local, "api", None)
+    _tesserocr_local.checked = True
+    _tesserocr_local.api = None
+    try:
+        import tesserocr
+        _tesserocr_local.api = tesserocr.PyTessBaseAPI(
+            lang="spa+eng",
+            psm=tesserocr.PSM.SINGLE_BLOCK,
+            oem=tesserocr.OEM.LSTM_ONLY,
+        )
+    except Exception:
+        pass  # sin tesserocr se usa pytesseract como siempre
+    return _tesserocr_local.api
 
 
+def load_moviepy():
+    """Resuelve ImageClip/AudioFileClip (API 1.x o 2.x) solo si hace falta el fallback."""
+    global moviepy_module, ImageClip, AudioFileClip
+    global _clip_fps_setter, _clip_audio_setter
+    if moviepy_module is not None:
+        return
+    with _heavy_imports_lock:
+        if moviepy_module is not None:
+            return
+        import importlib
+        module = importlib.import_module("moviepy")
+        if hasattr(module, "ImageClip") and hasattr(module, "AudioFileClip"):
+            ImageClip = module.ImageClip
+            AudioFileClip = module.AudioFileClip
+        else:
+            editor_module = importlib.import_module("moviepy.editor")
+            ImageClip = editor_module.ImageClip
+            AudioFileClip = editor_module.AudioFileClip
+        # Resolver una sola vez la API de clips (2.x with_* vs 1.x set_*)
+        _clip_fps_setter = getattr(ImageClip, "with_fps", None) \
+            or getattr(ImageClip, "set_fps", None)
+        _clip_audio_setter = getattr(ImageClip, "with_audio", None) \
+            or getattr(ImageClip, "set_audio", None)
+        moviepy_module = module
+
+
+@functools.lru_cache(maxsize=1)
 def configure_tesseract() -> bool:
-    """Configura la ruta de Tesseract si está disponible en PATH o en rutas comunes."""
+    """Configura la ruta de Tesseract si está disponible en PATH o en rutas comunes.
+
+    El resultado se memoiza: se llama desde la validación y desde cada OCR,
+    y la búsqueda en disco no cambia durante la vida del proceso.
+    """
+    load_heavy_modules()
     custom_cmd = os.environ.get("TESSERACT_CMD")
     if custom_cmd and os.path.exists(custom_cmd):
         pytesseract.pytesseract.tesseract_cmd = custom_cmd
@@ -100,6 +193,32 @@ def configure_tesseract() -> bool:
     return False
 
 
+@functools.lru_cache(maxsize=1)
+def detect_hw_encoder(ffmpeg_cmd: str) -> str:
+    """Devuelve el primer encoder h264 por hardware que anuncia ffmpeg, o ''."""
+    try:
+        result = subprocess.run(
+            [ffmpeg_cmd, "-hide_banner", "-encoders"],
+            capture_output=True, text=True, timeout=15
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    for encoder in ("h264_nvenc", "h264_qsv", "h264_videotoolbox", "h264_amf"):
+        if encoder in result.stdout:
+            return encoder
+    return ""
+
+
+def dependencies_help_message(exc: ImportError) -> str:
+    return (
+        "Faltan dependencias de Python para procesar el video.\n\n"
+        "1) Instalalas con: pip install -r requirements.txt\n"
+        "2) O relanzá la app con la variable AUTO_INSTALL_DEPS=1 para que\n"
+        "   intente instalarlas automáticamente.\n\n"
+        f"Detalle: {exc}"
+    )
+
+
 def tesseract_help_message() -> str:
     return (
         "No se encontró Tesseract OCR instalado.\n\n"
@@ -115,47 +234,147 @@ def tesseract_help_message() -> str:
 # LÓGICA PRINCIPAL
 # ══════════════════════════════════════════════
 
+# Palabras alfabéticas de 5+ letras candidatas a hashtag, en un solo scan C
+_KEYWORD_RE = re.compile(r"[A-Za-zÁÉÍÓÚáéíóúñÑ]{5,}")
+
+# Palabras comunes que no sirven como hashtag (solo las de 5+ letras importan)
+_TAG_STOPWORDS = frozenset({
+    # español
+    "ahora", "antes", "aunque", "contiene", "cuando", "desde", "donde",
+    "entre", "estamos", "fueron", "gracias", "hacia", "mucho", "nuestra",
+    "nuestro", "otros", "porque", "pueden", "siempre", "sobre", "también",
+    "tiene", "todas", "todos", "álbum", "música",
+    # inglés
+    "about", "after", "album", "because", "could", "every", "music",
+    "other", "there", "these", "those", "where", "which", "while", "would",
+})
+
+# Marcadores que anuncian la línea del álbum en el texto OCR
+_ALBUM_RE = re.compile(r"RETRATO DE|ALBUM|ÁLBUM")
+
+# Plantilla de la descripción de YouTube, armada una sola vez
+_DESCRIPTION_TEMPLATE = """🎵 {title}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+📋 TRACKLIST / INFORMACIÓN:
+
+{body}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+✨ Si disfrutás la música, dejá tu like y suscribite para más contenido.
+🔔 Activá la campanita para no perderte ningún lanzamiento.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+{tags}
+"""
+
+
 class MusicVideoProcessor:
     """Toda la lógica de procesamiento."""
 
     VIDEO_W = 1920
     VIDEO_H = 1080
 
+    # Preset x264 del fallback moviepy; bajar a "ultrafast" en hardware flojo
+    X264_PRESET = "faster"
+
+    # Conexión HTTPS compartida para las llamadas de IA (keep-alive)
+    _ai_connection = None
+    _ai_connection_host = None
+
+    # Respuestas de IA cacheadas por hash del prompt: re-renderizar el mismo
+    # álbum no debería pagar el endpoint dos veces
+    AI_CACHE_PATH = os.path.join(tempfile.gettempdir(), "ytuploader_ai_cache.json")
+
+    # Texto OCR por (ruta, mtime, tamaño): a nivel clase porque se crea un
+    # procesador nuevo por corrida y el usuario suele re-renderizar el mismo álbum
+    _ocr_cache = {}
+
     def __init__(self, progress_callback=None, log_callback=None):
         self.progress = progress_callback or (lambda v, t: None)
         self.log = log_callback or print
+        # Binarización Otsu previa al OCR; apagar para fotos muy mal iluminadas
+        self.use_otsu = True
+        # BGR decodificados durante el OCR, para no decodificar dos veces
+        # la misma foto cuando create_video arma el frame
+        self._decoded = {}
 
     def _apply_fps(self, clip, fps: int):
-        if hasattr(clip, "with_fps"):
-            return clip.with_fps(fps)
-        if hasattr(clip, "set_fps"):
-            return clip.set_fps(fps)
+        if _clip_fps_setter is not None:
+            return _clip_fps_setter(clip, fps)
         setattr(clip, "fps", fps)
         return clip
 
     def _apply_audio(self, clip, audio_clip):
-        if hasattr(clip, "with_audio"):
-            return clip.with_audio(audio_clip)
-        if hasattr(clip, "set_audio"):
-            return clip.set_audio(audio_clip)
+        if _clip_audio_setter is not None:
+            return _clip_audio_setter(clip, audio_clip)
         setattr(clip, "audio", audio_clip)
         return clip
 
     # ── OCR ──────────────────────────────────
     def extract_text_from_image(self, image_path: str) -> str:
         self.log(f"🔍 Extrayendo texto de: {os.path.basename(image_path)}")
+        cache_key = (image_path, os.path.getmtime(image_path), os.path.getsize(image_path))
+        cached = self._ocr_cache.get(cache_key)
+        if cached is not None:
+            self.log("📖 Texto recuperado de cache (imagen sin cambios).")
+            return cached
+
+        load_heavy_modules()
         if not configure_tesseract():
             raise RuntimeError(tesseract_help_message())
 
-        img = Image.open(image_path)
-        # Preprocesado para mejorar OCR
-        img_gray = img.convert("L")
-        img_sharp = img_gray.filter(ImageFilter.SHARPEN)
-        try:
-            text = pytesseract.image_to_string(img_sharp, lang="spa+eng")
-        except pytesseract.TesseractNotFoundError as exc:
-            raise RuntimeError(tesseract_help_message()) from exc
-        return text.strip()
+        # Todo el preprocesado en un solo pipeline cv2 (decode → escala →
+        # unsharp → Otsu) sin ida y vuelta por PIL: los píxeles viajan en un
+        # único buffer uint8 desde el archivo hasta tesseract. Se decodifica
+        # en color para que create_video reutilice el mismo array.
+        bgr = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if bgr is None:
+            # cv2 no pudo decodificar: PIL de respaldo
+            gray = np.asarray(Image.open(image_path).convert("L"))
+        else:
+            self._decoded[image_path] = bgr
+            gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+
+        # Tesseract rinde mejor alrededor de ~1600px de lado largo (~300 DPI):
+        # achicar fotos de celular acelera el OCR sin perder precisión, y
+        # agrandar miniaturas chicas mejora el reconocimiento del LSTM.
+        scale = 1600 / max(gray.shape)
+        if scale < 0.95:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale,
+                              interpolation=cv2.INTER_AREA)
+        elif scale > 1.2:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale,
+                              interpolation=cv2.INTER_CUBIC)
+
+        # Unsharp mask + binarización Otsu, bastante más preciso para
+        # Tesseract que el SHARPEN fijo de PIL.
+        blur = cv2.GaussianBlur(gray, (0, 0), 3.0)
+        sharp = cv2.addWeighted(gray, 1.5, blur, -0.5, 0)
+        if self.use_otsu:
+            _, bw = cv2.threshold(sharp, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        else:
+            bw = sharp
+
+        api = get_tesserocr_api()
+        if api is not None:
+            # Vía rápida: libtesseract en proceso, modelos ya cargados
+            api.SetImage(Image.fromarray(bw))
+            text = api.GetUTF8Text()
+        else:
+            try:
+                # --oem 1: motor LSTM; --psm 6: bloque uniforme de texto, que
+                # calza con contratapas de álbum y evita el análisis de layout.
+                text = pytesseract.image_to_string(bw, lang="spa+eng",
+                                                   config="--oem 1 --psm 6")
+            except pytesseract.TesseractNotFoundError as exc:
+                raise RuntimeError(tesseract_help_message()) from exc
+        text = text.strip()
+        self._ocr_cache[cache_key] = text
+        return text
 
     # ── Descripción para YouTube ──────────────
     def generate_description(self, text1: str, text2: str) -> dict:
@@ -173,8 +392,7 @@ class MusicVideoProcessor:
                 cleaned.append(normalized)
 
         for index, line in enumerate(cleaned[:12]):
-            upper = line.upper()
-            if "RETRATO DE" in upper or "ALBUM" in upper or "ÁLBUM" in upper:
+            if _ALBUM_RE.search(line.upper()):
                 album = line.title()
                 if index + 1 < len(cleaned):
                     candidate_artist = cleaned[index + 1]
@@ -200,36 +418,29 @@ class MusicVideoProcessor:
 
         title_line = f"Full Album - {album} - {artist}"[:100]
         
-        # Hashtags automáticos desde palabras clave del texto
-        keywords = set()
-        for line in lines:
-            for word in line.split():
-                word_clean = word.strip(".,;:!?\"'()[]").lower()
-                if len(word_clean) > 4:
-                    keywords.add(word_clean)
-        
+        # Hashtags automáticos desde palabras clave del texto: se recorre el
+        # OCR en orden, salteando stopwords y repetidas, y se corta en 10 sin
+        # materializar el set completo de tokens.
+        seen = set()
+
+        def keyword_candidates():
+            for match in _KEYWORD_RE.finditer(combined):
+                word = match.group().lower()
+                if word in _TAG_STOPWORDS or word in seen:
+                    continue
+                seen.add(word)
+                yield word
+
         # Hashtags de música siempre presentes
         base_tags = ["#music", "#músicaindependiente", "#newmusic", "#indiemusic", "#músicaargentina"]
-        custom_tags = [f"#{w}" for w in list(keywords)[:10] if w.isalpha()]
+        custom_tags = [f"#{w}" for w in itertools.islice(keyword_candidates(), 10)]
         all_tags = base_tags + custom_tags
 
-        description = f"""🎵 {title_line}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📋 TRACKLIST / INFORMACIÓN:
-
-{combined}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-✨ Si disfrutás la música, dejá tu like y suscribite para más contenido.
-🔔 Activá la campanita para no perderte ningún lanzamiento.
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-{chr(10).join(all_tags)}
-"""
+        description = _DESCRIPTION_TEMPLATE.format(
+            title=title_line,
+            body=combined,
+            tags="\n".join(all_tags)
+        )
         return {
             "title": title_line[:100],  # YouTube max 100 chars
             "description": description,
@@ -252,6 +463,64 @@ class MusicVideoProcessor:
         self.log(f"📝 Metadata guardada: {metadata_path}")
         return metadata_path
 
+    def _load_ai_cache(self) -> dict:
+        try:
+            with open(self.AI_CACHE_PATH, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_ai_cache(self, cache: dict):
+        try:
+            with open(self.AI_CACHE_PATH, "w", encoding="utf-8") as file:
+                json.dump(cache, file, ensure_ascii=False)
+        except OSError:
+            pass  # el cache es best-effort
+
+    def _ai_http_post(self, endpoint: str, request_data: bytes, api_key: str) -> str:
+        """POST JSON reusando una conexión HTTPS keep-alive y aceptando gzip.
+
+        Abrir un TLS handshake nuevo por llamada domina el tiempo cuando se
+        procesan varios álbumes seguidos; la conexión se cachea a nivel clase
+        y se reabre sola si el servidor la cerró.
+        """
+        parts = urllib.parse.urlsplit(endpoint)
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+            "Accept-Encoding": "gzip",
+        }
+
+        # AI_API_BASE puede apuntar a un servidor local sin TLS (LM Studio,
+        # ollama, etc.): respetar el esquema en vez de forzar HTTPS.
+        conn_cls = (http.client.HTTPConnection if parts.scheme == "http"
+                    else http.client.HTTPSConnection)
+        origin = f"{parts.scheme}://{parts.netloc}"
+
+        cls = MusicVideoProcessor
+        for attempt in (0, 1):
+            conn = cls._ai_connection
+            if conn is None or cls._ai_connection_host != origin:
+                conn = conn_cls(parts.netloc, timeout=60)
+                cls._ai_connection = conn
+                cls._ai_connection_host = origin
+            try:
+                conn.request("POST", parts.path or "/", body=request_data, headers=headers)
+                response = conn.getresponse()
+                raw = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # Conexión vencida o rechazada: cerrar y reintentar una vez en frío
+                conn.close()
+                cls._ai_connection = None
+                if attempt:
+                    raise
+
+        if response.getheader("Content-Encoding", "") == "gzip":
+            raw = gzip.decompress(raw)
+        return raw.decode("utf-8", errors="ignore")
+
     def improve_metadata_with_ai(self, metadata: dict) -> dict:
         """Corrige ortografía/estilo usando IA online (API compatible con OpenAI)."""
         api_key = os.environ.get("AI_API_KEY", "").strip()
@@ -269,6 +538,15 @@ class MusicVideoProcessor:
             "tags": metadata.get("tags", []),
         }
 
+        cache_key = hashlib.sha256(
+            json.dumps(prompt, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        cache = self._load_ai_cache()
+        cached = cache.get(cache_key)
+        if isinstance(cached, dict):
+            self.log("✨ Metadata corregida con IA (cache).")
+            return cached
+
         payload = {
             "model": model,
             "temperature": 0.2,
@@ -290,19 +568,9 @@ class MusicVideoProcessor:
         }
 
         request_data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            endpoint,
-            data=request_data,
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}",
-            },
-            method="POST"
-        )
 
         try:
-            with urllib.request.urlopen(req, timeout=60) as response:
-                raw = response.read().decode("utf-8", errors="ignore")
+            raw = self._ai_http_post(endpoint, request_data, api_key)
             data = json.loads(raw)
             content = data["choices"][0]["message"]["content"]
             fixed = json.loads(content) if isinstance(content, str) else content
@@ -322,42 +590,133 @@ class MusicVideoProcessor:
             if not title.startswith("Full Album -"):
                 title = metadata.get("title", title)
 
-            self.log("✨ Metadata corregida con IA.")
-            return {
+            improved = {
                 "title": title,
                 "description": description,
                 "tags": tags or metadata.get("tags", [])
             }
+            cache[cache_key] = improved
+            self._save_ai_cache(cache)
+            self.log("✨ Metadata corregida con IA.")
+            return improved
         except Exception as exc:
             self.log(f"⚠️ IA no disponible ({exc}). Se usa metadata original.")
             return metadata
 
     # ── Preparar frame de imagen ──────────────
-    def _prepare_half_frame(self, image_path: str, side: str) -> np.ndarray:
-        """Redimensiona imagen para ocupar mitad del frame 1920x1080."""
+    def _prepare_half_frame(self, image_path: str, side: str,
+                            out: np.ndarray = None) -> np.ndarray:
+        """Redimensiona imagen para ocupar mitad del frame 1920x1080.
+
+        Si se pasa `out` (una vista sobre el frame final), el resultado se
+        escribe ahí y las copias intermedias mueren al salir de la función.
+        """
         half_w = self.VIDEO_W // 2  # 960
-        img = Image.open(image_path).convert("RGB")
-        img = img.resize((half_w, self.VIDEO_H), Image.LANCZOS)
-        return np.array(img)
+        load_heavy_modules()
+        # pop: el array decodificado en el OCR se usa una vez y se libera
+        img = self._decoded.pop(image_path, None)
+        if img is None:
+            img = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if img is None:
+            # cv2 no pudo decodificar (p.ej. ruta con caracteres raros): PIL de respaldo
+            pil_img = Image.open(image_path).convert("RGB")
+            pil_img = pil_img.resize((half_w, self.VIDEO_H), Image.LANCZOS)
+            rgb = np.array(pil_img)
+        else:
+            # AREA para achicar, CUBIC si la foto es más chica que la mitad del frame
+            interp = cv2.INTER_AREA if img.shape[1] > half_w else cv2.INTER_CUBIC
+            img = cv2.resize(img, (half_w, self.VIDEO_H), interpolation=interp)
+            rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        if out is not None:
+            out[...] = rgb
+            return out
+        return rgb
 
     # ── Generar video ─────────────────────────
-    def create_video(self, wav_path: str, img1_path: str, img2_path: str, output_path: str) -> str:
-        self.log("🎬 Creando video...")
-        self.progress(30, "Preparando imágenes...")
-
-        left_frame = self._prepare_half_frame(img1_path, "left")
-        right_frame = self._prepare_half_frame(img2_path, "right")
+    def _find_ffmpeg(self) -> str:
+        """Busca un binario de ffmpeg usable (PATH o el que trae imageio-ffmpeg)."""
+        path_cmd = shutil.which("ffmpeg")
+        if path_cmd:
+            return path_cmd
+        try:
+            import imageio_ffmpeg
+            return imageio_ffmpeg.get_ffmpeg_exe()
+        except Exception:
+            return ""
+
+    def _create_video_ffmpeg(self, ffmpeg_cmd: str, frame_png: str,
+                             wav_path: str, output_path: str) -> str:
+        """Muxea frame estático + audio directo con ffmpeg.
+
+        El frame nunca cambia, así que no tiene sentido reenviar el mismo numpy
+        array 24 veces por segundo al encoder: se escribe un PNG una sola vez y
+        x264 lo codifica como un keyframe + P-frames de skip.
+        """
+        self.progress(60, "Exportando video con ffmpeg...")
+
+        # Con un frame constante la estimación de movimiento nunca encuentra
+        # nada: ultrafast + GOP largo sin scenecut ni B-frames produce el
+        # mismo resultado visual en menos CPU.
+        libx264_args = [
+            "-c:v", "libx264", "-preset", "ultrafast", "-tune", "stillimage",
+            "-g", "240",
+            "-x264-params", "keyint=240:min-keyint=240:scenecut=0",
+            "-bf", "0",
+        ]
+
+        hw_encoder = detect_hw_encoder(ffmpeg_cmd)
+        if hw_encoder:
+            video_args = ["-c:v", hw_encoder]
+            if hw_encoder == "h264_nvenc":
+                video_args += ["-preset", "p1"]
+            elif hw_encoder == "h264_qsv":
+                video_args += ["-preset", "veryfast"]
+            self.log(f"⚡ Encoder por hardware: {hw_encoder}")
+        else:
+            video_args = libx264_args
+
+        def encode(codec_args):
+            return subprocess.run(
+                [
+                    ffmpeg_cmd, "-y",
+                    # 2 fps alcanza para un frame fijo: 12x menos frames que 24
+                    # y YouTube re-encodea igual.
+                    "-loop", "1", "-framerate", "2", "-i", frame_png,
+                    "-i", wav_path,
+                ]
+                + codec_args
+                + [
+                    "-pix_fmt", "yuv420p",
+                    "-c:a", "aac", "-b:a", "192k",
+                    "-shortest", "-movflags", "+faststart",
+                    output_path,
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
 
-        # Combinar lado a lado
-        combined = np.concatenate([left_frame, right_frame], axis=1)  # (1080, 1920, 3)
+        result = encode(video_args)
+        if result.returncode != 0 and hw_encoder:
+            # Que el encoder figure en la lista no garantiza que el driver
+            # funcione: reintentar por software antes de rendirse.
+            self.log(f"⚠️ {hw_encoder} falló. Reintentando con libx264...")
+            result = encode(libx264_args)
+        if result.returncode != 0:
+            stderr_tail = result.stderr.decode("utf-8", errors="ignore")[-500:]
+            raise RuntimeError(f"ffmpeg falló al exportar el video:\n{stderr_tail}")
+        return output_path
 
+    def _create_video_moviepy(self, frame_png: str,
+                              wav_path: str, output_path: str) -> str:
+        """Fallback con moviepy cuando no hay ffmpeg invocable directamente."""
+        load_moviepy()
         self.progress(40, "Cargando audio...")
         audio = AudioFileClip(wav_path)
         duration = audio.duration
         self.log(f"⏱️ Duración del audio: {duration:.1f}s")
 
         self.progress(50, "Generando clip de video...")
-        video_clip = ImageClip(combined, duration=duration)
+        video_clip = ImageClip(frame_png, duration=duration)
         video_clip = self._apply_fps(video_clip, 24)
         video_clip = self._apply_audio(video_clip, audio)
 
@@ -367,11 +726,62 @@ class MusicVideoProcessor:
             fps=24,
             codec="libx264",
             audio_codec="aac",
-            preset="fast",
+            preset=self.X264_PRESET,
+            threads=os.cpu_count() or 4,
+            ffmpeg_params=["-movflags", "+faststart", "-tune", "stillimage",
+                           "-pix_fmt", "yuv420p"],
             logger=None
         )
         video_clip.close()
         audio.close()
+        return output_path
+
+    def create_video(self, wav_path: str, img1_path: str, img2_path: str, output_path: str) -> str:
+        self.log("🎬 Creando video...")
+        load_heavy_modules()
+        self.progress(30, "Preparando imágenes...")
+
+        # Frame final preasignado: cada mitad se escribe directo en su vista,
+        # sin el buffer extra de np.concatenate.
+        combined = np.empty((self.VIDEO_H, self.VIDEO_W, 3), dtype=np.uint8)
+        half_w = self.VIDEO_W // 2
+
+        # Decodificar/redimensionar ambas fotos en paralelo: el trabajo pesado
+        # ocurre en C (cv2/PIL) y libera el GIL.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            left_future = executor.submit(
+                self._prepare_half_frame, img1_path, "left", combined[:, :half_w])
+            right_future = executor.submit(
+                self._prepare_half_frame, img2_path, "right", combined[:, half_w:])
+            left_future.result()
+            right_future.result()
+
+        # El frame queda en disco una sola vez; liberar los ~6 MB del buffer
+        # antes del encode mantiene el pico de memoria en lo que use ffmpeg.
+        tmp_png = os.path.join(tempfile.gettempdir(), f"frame_{os.getpid()}.png")
+        cv2.imwrite(tmp_png, cv2.cvtColor(combined, cv2.COLOR_RGB2BGR))
+        del combined
+        gc.collect()
+
+        try:
+            ffmpeg_cmd = self._find_ffmpeg()
+            if ffmpeg_cmd:
+                # La duración sale del header WAV: no hace falta abrir un
+                # AudioFileClip (y su proceso ffmpeg lector) solo para loguearla.
+                try:
+                    with wave.open(wav_path, "rb") as wav_file:
+                        duration = wav_file.getnframes() / wav_file.getframerate()
+                    self.log(f"⏱️ Duración del audio: {duration:.1f}s")
+                except (wave.Error, OSError):
+                    pass  # -shortest define la duración; el log es solo informativo
+                self._create_video_ffmpeg(ffmpeg_cmd, tmp_png, wav_path, output_path)
+            else:
+                self.log("⚠️ ffmpeg no encontrado. Usando moviepy (más lento).")
+                self._create_video_moviepy(tmp_png, wav_path, output_path)
+        finally:
+            if os.path.exists(tmp_png):
+                os.remove(tmp_png)
+
         self.log(f"✅ Video guardado: {output_path}")
         return output_path
 
@@ -392,8 +802,13 @@ class App(tk.Tk):
         self.img2_path = tk.StringVar()
         self.output_path = tk.StringVar(value=os.path.join(os.path.expanduser("~"), "output_video.mp4"))
         self.last_metadata_path = ""
+        # El hilo de trabajo nunca toca widgets: encola acá y el main loop
+        # drena cada 100 ms
+        self._log_q = queue.Queue()
+        self._pending_progress = None
 
         self._build_ui()
+        self.after(100, self._drain_log_queue)
 
     # ── UI ───────────────────────────────────
     def _build_ui(self):
@@ -525,9 +940,29 @@ class App(tk.Tk):
             var.set(path)
 
     def _log(self, msg):
-        self.log_box.insert("end", msg + "\n")
-        self.log_box.see("end")
-        self.update_idletasks()
+        self._log_q.put(msg)
+
+    def _drain_log_queue(self):
+        """Vuelca en lote log y progreso pendientes; corre cada 100 ms en el main loop."""
+        lines = []
+        while True:
+            try:
+                lines.append(self._log_q.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            self.log_box.insert("end", "\n".join(lines) + "\n")
+            self.log_box.see("end")
+
+        pending = self._pending_progress
+        if pending is not None:
+            self._pending_progress = None
+            value, text = pending
+            self.progress_var.set(value)
+            if text:
+                self.status_label.config(text=text)
+
+        self.after(100, self._drain_log_queue)
 
 
     def _copy_title(self):
@@ -595,10 +1030,9 @@ class App(tk.Tk):
                 text="📋 Copiar descripción"
             )
     def _set_progress(self, value, text=""):
-        self.progress_var.set(value)
-        if text:
-            self.status_label.config(text=text)
-        self.update_idletasks()
+        # Solo anota el último estado: el drenaje periódico lo aplica y las
+        # ráfagas de updates del hilo de trabajo se coalescen en una sola
+        self._pending_progress = (value, text)
 
     def _set_buttons(self, enabled: bool):
         state = "normal" if enabled else "disabled"
@@ -618,7 +1052,15 @@ class App(tk.Tk):
         if not self.output_path.get():
             messagebox.showerror("Error", "Indicá dónde guardar el video.")
             return False
-        if not configure_tesseract():
+        try:
+            tesseract_ok = configure_tesseract()
+        except ImportError as exc:
+            # Con los imports diferidos el primer contacto con las dependencias
+            # pesadas es acá: sin este catch el botón quedaría "muerto" y el
+            # traceback iría a un stderr invisible bajo pythonw.
+            messagebox.showerror("Dependencias faltantes", dependencies_help_message(exc))
+            return False
+        if not tesseract_ok:
             messagebox.showerror("Tesseract no encontrado", tesseract_help_message())
             return False
         return True
@@ -643,14 +1085,19 @@ class App(tk.Tk):
             log_callback=self._log
         )
         try:
-            self._log(f"ℹ️ MoviePy detectado: {getattr(moviepy_module, '__version__', 'desconocido')}")
+            if moviepy_module is not None:
+                self._log(f"ℹ️ MoviePy detectado: {getattr(moviepy_module, '__version__', 'desconocido')}")
 
             # 1. OCR
             self._set_progress(10, "Leyendo texto de fotos (OCR)...")
             self._log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
             self._log("PASO 1: OCR en imágenes")
-            text1 = processor.extract_text_from_image(self.img1_path.get())
-            text2 = processor.extract_text_from_image(self.img2_path.get())
+            # Cada OCR corre en un subproceso tesseract aparte: dos fotos, dos cores.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                text1, text2 = executor.map(
+                    processor.extract_text_from_image,
+                    [self.img1_path.get(), self.img2_path.get()]
+                )
             self._log(f"📖 Texto foto 1:\n{text1[:300]}{'...' if len(text1)>300 else ''}")
             self._log(f"📖 Texto foto 2:\n{text2[:300]}{'...' if len(text2)>300 else ''}")
             self._set_progress(20, "OCR completado. Generando descripción...")
@@ -693,6 +1140,10 @@ class App(tk.Tk):
                 f"Metadata: {metadata_path}"
             )
 
+        except ImportError as e:
+            self._log(f"\n❌ ERROR: {e}")
+            messagebox.showerror("Dependencias faltantes", dependencies_help_message(e))
+            self._set_progress(0, "Error.")
         except Exception as e:
             self._log(f"\n❌ ERROR: {e}")
             messagebox.showerror("Error", str(e))